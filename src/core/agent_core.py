@@ -1,7 +1,6 @@
 import os
 import traceback
-from typing import Dict, Any
-import pytest
+from typing import Dict, Any, Optional
 
 from core.logger import Logger
 from core.utilities import read_file, yaml_dict_load
@@ -18,9 +17,10 @@ class AgentCore:
     Manages the core loop, initialization, and component orchestration.
     """
     
-    def __init__(self, constants: Dict[str, Any]):
+    def __init__(self, constants: Dict[str, Any], logger: Optional[Logger] = None):
         self._constants = constants
-        self._logger = Logger(constants)
+        self._task_thought = constants['AGENT']['TASK_THOUGHT']
+        self._logger = logger if logger else Logger(constants)
         self._agent_principles = read_file(constants['FILE_PATHS']['AGENT_PRINCIPLES_FILE'])
         self._logger.log_info("Initializing AgentCore")
         
@@ -35,7 +35,7 @@ class AgentCore:
     def _debug(self, debug_str: str):
         self._logger.log_warning(debug_str)
         self._logger.log_warning(f"Resetting actions with debug REASON, adding current task to todo")
-        self._memory.add_immediate_todo(self._memory.get_thought(self._constants['AGENT']['TASK_THOUGHT']))
+        self._memory.add_immediate_todo(self._memory.get_thought(self._task_thought))
         self._memory.reset_actions(
             f"Review logs in memory and debug what went wrong. Implement Fix. Then continue with previous task (now at front of todo list)", 
             debug_str
@@ -47,64 +47,79 @@ class AgentCore:
         self._memory.set_count(Count.REASON, 0)
         max_steps = self._constants['AGENT']['MAX_REASON_STEPS']
 
+        # Loop invariants bound to locals
+        memory = self._memory
+        logger = self._logger
+        task_thought = self._task_thought
+        get_next_actions = self._reason.get_next_actions
+        exec_action = self._action_handler.exec_action
+
         while True:
-            self._memory.load_logs()
-            self._memory.memorize()
+            memory.load_logs()
+            memory.memorize()
 
-            action_list = self._memory.list_actions()
+            action_list = memory.list_actions()
             if not action_list:
-                self._logger.log_warning("Ran out of actions")
-                self._logger.log_info(f"Resetting actions, adding [REASON: Plan] action")
-                self._memory.reset_actions("Plan", "action queue was empty")
+                logger.log_warning("Ran out of actions")
+                logger.log_info(f"Resetting actions, adding [REASON: Plan] action")
+                memory.reset_actions("Plan", "action queue was empty")
 
             # TERMINATE when todo list is empty, but leave last reason action
-            todo = self._memory.get_todo_list()
+            todo = memory.get_todo_list()
             if not todo:
-                last_action = self._memory.pop_last_action()
-                self._memory.empty_actions()
-                self._memory.add_action(TerminateAction(
+                last_action = memory.pop_last_action()
+                memory.empty_actions()
+                memory.add_action(TerminateAction(
                     explanation = "empty todo list"
                 ))
-                self._memory.add_action(last_action)
+                memory.add_action(last_action)
 
-            action = self._memory.pop_action()
+            action = memory.pop_action()
 
             try:
                 if isinstance(action, TerminateAction):
-                    self._logger.log_info("TERMINATE action in queue, Agent terminating")
+                    logger.log_info("TERMINATE action in queue, Agent terminating")
                     break
                 
                 elif isinstance(action, ReasonAction):
-                    reason_count = self._memory.inc_count(Count.REASON)
-                    self._memory.set_thought(self._constants['AGENT']['TASK_THOUGHT'], action.task)
+                    reason_count = memory.inc_count(Count.REASON)
+                    memory.set_thought(task_thought, action.task)
                     
                     if reason_count == max_steps:
-                        self._logger.log_info("Reason limit reached, Agent terminating")
+                        logger.log_info("Reason limit reached, Agent terminating")
                         break
 
-                    self._logger.log_action(action, action.task)
-                    new_actions = self._reason.get_next_actions(action)
+                    logger.log_action(action, action.task)
+                    new_actions = get_next_actions(action)
                     if new_actions:
                         last_action = new_actions[-1]
                         if last_action.type != ActionType.REASON:
                             self._debug("last reason action returned an action list that didn't end with a REASON action")
                         
                         else:
-                            self._memory.add_actions(new_actions)
-                            self._logger.log_info(f"Queued {len(new_actions)} new actions")
+                            memory.add_actions(new_actions)
+                            logger.log_info(f"Queued {len(new_actions)} new actions")
                     else:
                         self._debug("last reason action returned no actions")
 
                 else:
-                    self._action_handler.exec_action(action)
+                    exec_action(action)
 
             except Exception as e:
-                self._logger.log_error(f"Failed to execute action {action.type.name}: {e}")
-                self._logger.log_error(f"Stack Trace: {traceback.format_exc()}")
+                logger.log_error(f"Failed to execute action {action.type.name}: {e}")
+                logger.log_error(f"Stack Trace: {traceback.format_exc()}")
                 self._debug(f"failed to execute action {action.type.name}")
 
+        # Save what the final pass changed
+        memory.load_logs()
+        memory.memorize()
+        logger.flush()
+
     def run_tests(self):
         """Runs all tests and outputs results"""
+        # Only test mode needs pytest
+        import pytest
+
         test_dir = self._constants['FILE_PATHS']['TEST_DIR']
         report_file = self._constants['FILE_PATHS']['TEST_OUTPUT']
         self._logger.log_info(f"Starting test run in directory: {test_dir}")
@@ -138,16 +153,33 @@ class AgentCore:
         self._logger.log_info("Test run finished.")
 
 # --- Main Entry Point ---
-if __name__ == "__main__":
+def main() -> int:
+    """Runs the agent and returns the process exit code."""
+    logger = None
     try:
         constants = yaml_dict_load(CONSTANTS_YAML)
-        agent = AgentCore(constants)
+        # Closed on every exit path, including a failed startup
+        logger = Logger(constants)
+        agent = AgentCore(constants, logger)
         if agent._memory.is_test():
             agent.run_tests()
         else:
             agent.run()
+        return 0
 
     except Exception as e:
-        print(f"Critical error during Agent execution: {e}")
-        print(traceback.format_exc())
-        os._exit(1)
\ No newline at end of file
+        if logger is None:
+            print(f"Critical error during Agent execution: {e}")
+            print(traceback.format_exc())
+        else:
+            logger.log_error(f"Critical error during Agent execution: {e}")
+            logger.log_error(f"Stack Trace: {traceback.format_exc()}")
+        return 1
+
+    finally:
+        if logger is not None:
+            logger.close()
+
+if __name__ == "__main__":
+    if main():
+        os._exit(1)
@@ -1,4 +1,5 @@
-from typing import Any, Dict, List, Union
+import collections
+from typing import Any, Deque, Dict, KeysView, List, Optional, Tuple, Union
 from core.logger import Logger
 from core.definitions.models import Mem, Count, Action, ReasonAction
 from core.utilities import json_typed_load, json_dump, current_timestamp, scan_files
@@ -13,9 +14,16 @@ class Memory:
         self._mem = json_typed_load(Mem, self._memory_file)
         self._mem.is_test = is_test
         self._mem.deployed_at = current_timestamp()
+        self._dirty = True
+        self._counters = self._mem.counters
+
+        # Deque for O(1) pops/prepends, Mem keeps the list form
+        self._action_queue: Deque[Action] = collections.deque(self._mem.action_queue)
+        self._actions_snapshot: Optional[Tuple[Action, ...]] = None
+        self._action_dumps: Dict[int, Tuple[Action, Dict[str, Any]]] = {}
         
         # Initialize action queue if empty
-        if (not self._mem.action_queue):
+        if (not self._action_queue):
             self.reset_actions(self._constants['AGENT']['STARTING_TASK'], "initial action")
             
         # Initialize file_contents with file structure if empty
@@ -30,11 +38,25 @@ class Memory:
         self.memorize()
 
     def memorize(self):
-        """Saves memory to disk."""
+        """Saves memory to disk if it changed since the last save."""
         # TODO: add file size checks that trigger compression functions
         # TODO: add validation to ensure memory isn't corrupted
+        # Log refreshes alone don't mark memory dirty
+        if not self._dirty:
+            return
         self._mem.last_memorized = current_timestamp()
+        self._mem.action_queue = list(self.list_actions())
         json_dump(self._mem, self._memory_file)
+        self._dirty = False
+
+    def _touch(self):
+        """Marks memory as changed since the last save."""
+        self._dirty = True
+
+    def _touch_queue(self):
+        """Marks the action queue as changed, dropping the cached list_actions snapshot."""
+        self._dirty = True
+        self._actions_snapshot = None
 
     def deployed_at(self) -> str:
         return self._mem.deployed_at
@@ -45,91 +67,133 @@ class Memory:
     def last_memorized(self) -> str:
         return self._mem.last_memorized
     
-    def load_logs(self):
+    def load_logs(self) -> List[str]:
+        """Refreshes the recent logs from the logger's in-memory tail and returns them."""
         self._mem.logs = self._logger.recent_logs()
+        return self._mem.logs
     
-    def get_filepaths(self) -> List[str]:
-        return [k for k in self._mem.file_contents]
+    def get_filepaths(self) -> KeysView[str]:
+        return self._mem.file_contents.keys()
+    
+    def has_file(self, file_path: str) -> bool:
+        """Checks whether a file path is tracked in memory."""
+        return file_path in self._mem.file_contents
     
     def get_file_contents(self, file_path: str):
         return self._mem.file_contents[file_path]
     
     def fill_file_contents(self, file_path: str, contents: str):
+        self._touch()
         self._mem.file_contents[file_path] = contents
 
     def remove_file(self, file_path: str):
+        self._touch()
         del self._mem.file_contents[file_path]
     
     def get_todo_list(self) -> List[str]:
         return self._mem.todo.copy()
 
     def remove_todo(self):
+        self._touch()
         self._mem.todo.pop(0)
 
     def add_todo(self, item: str):
+        self._touch()
         self._mem.todo.append(item)
 
     def add_immediate_todo(self, item: str):
+        self._touch()
         self._mem.todo.insert(0, item)
 
     def get_count(self, counter: Count) -> int:
-        return self._mem.counters[counter]
+        return getattr(self._counters, counter.value)
     
     def inc_count(self, counter: Count) -> int:
-        self._mem.counters[counter] += 1
-        return self._mem.counters[counter]
+        self._touch()
+        val = getattr(self._counters, counter.value) + 1
+        setattr(self._counters, counter.value, val)
+        return val
     
     def set_count(self, counter: Count, val: int):
-        self._mem.counters[counter] = val
+        self._touch()
+        setattr(self._counters, counter.value, val)
 
-    def list_counts(self) -> Dict[Count, int]:
-        return self._mem.counters.copy()
+    def list_counts(self) -> Dict[str, int]:
+        return self._counters.model_dump()
     
     def reset_actions(self, start_task: str, explanation: str):
-        action = ReasonAction()
-        action.task = start_task
-        action.explanation = explanation
-        self._mem.action_queue = [action]
+        self._touch_queue()
+        action = ReasonAction(task=start_task, explanation=explanation)
+        self._action_queue.clear()
+        self._action_queue.append(action)
 
     def empty_actions(self):
-        self._mem.action_queue = []
+        self._touch_queue()
+        self._action_queue.clear()
 
     def pop_action(self) -> Action:
         """Removes and returns the next action from the front of the queue."""
-        if not self._mem.action_queue:
+        if not self._action_queue:
             raise LookupError("Tried to pop empty action queue")
-        return self._mem.action_queue.pop(0)
+        self._touch_queue()
+        return self._action_queue.popleft()
     
     def pop_last_action(self) -> Action:
         """Removes and returns the last action from the end of the queue."""
-        if not self._mem.action_queue:
+        if not self._action_queue:
             raise LookupError("Tried to pop empty action queue")
-        return self._mem.action_queue.pop()
+        self._touch_queue()
+        return self._action_queue.pop()
 
     def add_action(self, action: Action):
         """Adds a single action to the end of the queue."""
-        self._mem.action_queue.append(action)
+        self._touch_queue()
+        self._action_queue.append(action)
 
     def prepend_action(self, action: Action):
         """Adds a single action to the start of the queue."""
-        self._mem.action_queue.insert(0,action)
+        self._touch_queue()
+        self._action_queue.appendleft(action)
 
     def add_actions(self, actions: List[Action]):
         """Adds a list of actions to the end of the queue."""
         if actions:
-            self._mem.action_queue.extend(actions)
-
-    def list_actions(self) -> List[Action]:
-        """Gets a copy of the action queue."""
-        return self._mem.action_queue.copy()
+            self._touch_queue()
+            self._action_queue.extend(actions)
+
+    def list_actions(self) -> Tuple[Action, ...]:
+        """Gets a snapshot of the action queue, cached until the queue changes."""
+        if self._actions_snapshot is None:
+            self._actions_snapshot = tuple(self._action_queue)
+        return self._actions_snapshot
+
+    def dump_actions(self) -> List[Dict[str, Any]]:
+        """Dumps the action queue to plain dicts, reusing dumps of actions already queued last time."""
+        previous = self._action_dumps
+        dumps = {}
+        queue = []
+        for action in self.list_actions():
+            # Action kept with its dump to pin its id
+            entry = previous.get(id(action))
+            if entry is None or entry[0] is not action:
+                entry = (action, action.model_dump(mode='json'))
+            dumps[id(action)] = entry
+            queue.append(entry[1])
+        self._action_dumps = dumps
+        return queue
 
     def set_thought(self, label: str, thought: str):
         """Adds or overwrites an indexed thought."""
+        self._touch()
         self._mem.thoughts[label] = thought
 
-    def list_thoughts(self) -> List[str]:
-        """Lists all thought labels."""
-        return list(self._mem.thoughts.keys())
+    def list_thoughts(self) -> KeysView[str]:
+        """Lists all thought labels as a live view."""
+        return self._mem.thoughts.keys()
+    
+    def has_thought(self, label: str) -> bool:
+        """Checks whether a thought label exists."""
+        return label in self._mem.thoughts
     
     def get_thought(self, label: str) -> str:
         """Gets the content of a single thought."""
@@ -137,8 +201,10 @@ class Memory:
     
     def remove_thought(self, label: str):
         """Removes a single thought."""
+        self._touch()
         del self._mem.thoughts[label]
 
     def forget(self):
         """Removes all thoughts."""
+        self._touch()
         self._mem.thoughts = {}
\ No newline at end of file
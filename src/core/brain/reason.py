@@ -1,9 +1,11 @@
 import os
-import json
-from typing import Any, Dict, List
+import math
+import time
+import random
+import collections
+import orjson
+from typing import Any, Deque, Dict, List, Tuple
 from pydantic import BaseModel
-from google import genai
-from google.genai.errors import APIError
 
 from core.logger import Logger
 from core.definitions.models import Action, ReasonAction, SlumberAction
@@ -89,9 +91,67 @@ class Reason:
             self._logger.log_error(f"Failed to get next actions from Gemini: {e}")
             return []
 
+class RateLimiter:
+    """Client-side pacing for the Gemini per minute and per day limits."""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, requests_per_day: int):
+        self._rpm = requests_per_minute
+        self._tpm = tokens_per_minute
+        self._rpd = requests_per_day
+
+        # Request token bucket, refilled at RPM / 60 per second
+        self._request_tokens = float(requests_per_minute)
+        self._last_refill = time.monotonic()
+
+        # (monotonic time, tokens) for calls made within the last minute
+        self._token_window: Deque[Tuple[float, int]] = collections.deque()
+
+        # Daily quota, reset at UTC midnight
+        self._day = int(time.time() // 86400)
+        self._requests_today = 0
+
+    def acquire(self) -> int:
+        """Takes a request slot if both limits allow it, otherwise returns the seconds to wait."""
+        now = time.monotonic()
+        self._request_tokens = min(self._rpm, self._request_tokens + (now - self._last_refill) * self._rpm / 60)
+        self._last_refill = now
+
+        window = self._token_window
+        while window and now - window[0][0] >= 60:
+            window.popleft()
+
+        wait = 0.0
+        if self._request_tokens < 1:
+            wait = (1 - self._request_tokens) * 60 / self._rpm
+        if window and sum(tokens for _, tokens in window) >= self._tpm:
+            wait = max(wait, 60 - (now - window[0][0]))
+
+        wall_time = time.time()
+        today = int(wall_time // 86400)
+        if today != self._day:
+            self._day = today
+            self._requests_today = 0
+        if self._requests_today >= self._rpd:
+            wait = max(wait, (today + 1) * 86400 - wall_time)
+
+        if wait:
+            return math.ceil(wait)
+        
+        self._request_tokens -= 1
+        self._requests_today += 1
+        return 0
+
+    def record_tokens(self, tokens: int):
+        """Adds the tokens used by a completed call to the TPM window."""
+        self._token_window.append((time.monotonic(), tokens))
+
+
 class Gemini:
     """Handles integration with the Gemini API for the agent's reasoning process."""
 
+    # Client shared across instances
+    _shared_client: Any = None
+
     def __init__(self, 
                  constants: Dict[str, Any], 
                  principles: str, 
@@ -108,36 +168,29 @@ class Gemini:
         if not api_key:
             raise ValueError("GEMINI_API_KEY environment variable not set. Cannot use REASON action.")
 
-        self._client = genai.Client()
+        # Lazy import, only needed once a key is set
+        from google import genai
+        from google.genai.errors import APIError
+        self._api_error = APIError
 
-    def _build_context_prompt(self, current_action: ReasonAction) -> str:
-        """Constructs the comprehensive prompt for the LLM."""
-        
-        # Serialize constants
-        constants = {
-          "MAX_REASON_STEPS": self._constants['AGENT']['MAX_REASON_STEPS']
-        }
-        constants_content = json.dumps(constants, indent=2)
-        
-        # Serialize memory
-        mem_files = self._memory.get_filepaths()
-        selected_memory = {
-          "action_queue": self._memory.list_actions(),
-          "counters": self._memory.list_counts(),
-          "file_contents": {
-            k: self._memory.get_file_contents(k) if k in current_action.files_to_send 
-            else ""
-            for k in mem_files
-          },
-          "thoughts": {k: self._memory.get_thought(k) for k in current_action.thoughts_to_send},
-          "logs": self._memory.load_logs(),
-          "todo": self._memory.get_todo_list(),
-          "last_memorized": self._memory.last_memorized()
-        }
-        memory_content = json.dumps(selected_memory, indent=2)
+        if Gemini._shared_client is None:
+            Gemini._shared_client = genai.Client()
+        self._client = Gemini._shared_client
 
-        # Construct the prompt
-        prompt = f"""
+        self._static_prompt = self._build_static_prompt()
+        self._constants_max_steps = None
+        self._generate_config: Dict[str, Any] = {}
+
+        self._rate_limiter = RateLimiter(
+            self._constants['API']['RPM_LIMIT'],
+            self._constants['API']['TPM_LIMIT'],
+            self._constants['API']['RPD_LIMIT']
+        )
+        self._retry_attempt = 0
+
+    def _build_static_prompt(self) -> str:
+        """Renders the system instruction that does not change between calls."""
+        return f"""
 I am an AI Agent. Your task is to decide my next actions to take based on the following information.
 
 # YOUR RESPONSE:
@@ -161,18 +214,12 @@ IMPORTANT: DO NOT TRY TO WRITE_FILE IN core/ ONLY IN secondary/ OR data/
 # MY AGENT PRINCIPLES:
 {self._principles}
 
-# MY CURRENT TASK:
-{current_action.task}
-(This task was assigned with the explanation: "{current_action.explanation}")
-
-# MY CONSTANTS:
-{constants_content}
-
 # MY MEMORY SCHEMA
 {{
   "action_queue": "<current List[Action] action queue>",
   "counters": "<Dict[str, int] counter variables>",
-  "file_contents": "Dict[str, str] that represents complete file structure, relevant file contents",
+  "file_paths": "<A List[str] of every file path, representing my complete file structure>",
+  "file_contents": "<Dict[str, str] of relevant file contents>",
   "thoughts": "<Dict[str, str] that represents my thoughts>",
   "logs": "<A List[str] of recent log statements>",
   "todo": "<A List[str] that represents my todo list>",
@@ -182,25 +229,109 @@ IMPORTANT: DO NOT TRY TO WRITE_FILE IN core/ ONLY IN secondary/ OR data/
 (I have more thoughts but am only sending those relevant to the task)
 (I am only sending the last {self._constants['AGENT']['LOG_TAIL_COUNT']} lines of logs)
 
-# MY CURRENT MEMORY:
-{memory_content}
 """
-        return prompt
+
+    def _system_config(self) -> Dict[str, Any]:
+        """Returns the generate config, re-rendering the system instruction only if the step limit was changed since the last call."""
+        max_steps = self._constants['AGENT']['MAX_REASON_STEPS']
+        if max_steps != self._constants_max_steps:
+            self._constants_max_steps = max_steps
+            constants_content = orjson.dumps({"MAX_REASON_STEPS": max_steps}).decode()
+            self._generate_config = {
+              "system_instruction": f"{self._static_prompt}# MY CONSTANTS:\n{constants_content}\n",
+              "response_mime_type": "application/json"
+            }
+        return self._generate_config
+
+    def _build_context_prompt(self, current_action: ReasonAction) -> str:
+        """Constructs the comprehensive prompt for the LLM."""
+        
+        # Serialize memory
+        memory = self._memory
+        get_file_contents = memory.get_file_contents
+        get_thought = memory.get_thought
+        file_paths = memory.get_filepaths()
+        thought_labels = memory.list_thoughts()
+        selected_memory = {
+          "action_queue": memory.dump_actions(),
+          "counters": memory.list_counts(),
+          "file_paths": list(file_paths),
+          "file_contents": {
+            k: get_file_contents(k)
+            for k in dict.fromkeys(current_action.files_to_send) if k in file_paths
+          },
+          "thoughts": {
+            k: get_thought(k)
+            for k in dict.fromkeys(current_action.thoughts_to_send) if k in thought_labels
+          },
+          "logs": memory.load_logs(),
+          "todo": memory.get_todo_list(),
+          "last_memorized": memory.last_memorized()
+        }
+        memory_content = orjson.dumps(selected_memory).decode()
+
+        # Construct the prompt, static sections go in the system instruction
+        return "".join((
+          "# MY CURRENT TASK:\n", current_action.task,
+          "\n(This task was assigned with the explanation: \"", current_action.explanation, "\")\n",
+          "\n# MY CURRENT MEMORY:\n", memory_content, "\n"
+        ))
+
+    def _retry_wait_seconds(self) -> int:
+        """Exponential backoff with jitter for consecutive failed calls."""
+        base = self._constants['AGENT']['GEMINI_WAIT_SECONDS']
+        delay = base * 2 ** self._retry_attempt + random.uniform(0, base)
+        self._retry_attempt += 1
+        return math.ceil(min(delay, self._constants['AGENT']['GEMINI_MAX_WAIT_SECONDS']))
+
+    def _record_usage(self, usage: Any):
+        """Logs the token usage reported by Gemini and records it with the rate limiter."""
+        if usage is None:
+            return
+        
+        prompt_tokens = usage.prompt_token_count or 0
+        cached_tokens = usage.cached_content_token_count or 0
+        output_tokens = usage.candidates_token_count or 0
+        total_tokens = usage.total_token_count or (prompt_tokens + output_tokens)
+        self._logger.log_info(
+            f"Gemini usage: {prompt_tokens} prompt tokens ({cached_tokens} cached), {output_tokens} output tokens, {total_tokens} total"
+        )
+        self._rate_limiter.record_tokens(total_tokens)
 
     def get_next_actions(self, current_action: ReasonAction) -> List[Action]:
         """
         Calls the Gemini API to get the next list of actions.
         """
+        wait_seconds = self._rate_limiter.acquire()
+        if wait_seconds:
+          self._logger.log_warning(f"Gemini rate limit reached. Queuing SLUMBER for {wait_seconds}s and retrying.")
+          return [
+              SlumberAction(
+                  seconds=wait_seconds,
+                  explanation="rate limit reached, waiting to retry"
+              ),
+              current_action
+          ]
+
         prompt = self._build_context_prompt(current_action)
+        config = self._system_config()
         self._logger.log_info(f"Sending prompt to Gemini for task: {current_action.task}")
 
         try: 
-          response = self._client.models.generate_content(
+          # Collect the full stream before parsing
+          stream = self._client.models.generate_content_stream(
               model=self._model_name,
               contents=prompt,
-              config={"response_mime_type": "application/json"}
+              config=config
           )
-        except APIError as e:
+          chunks = []
+          usage = None
+          for chunk in stream:
+            if chunk.text:
+              chunks.append(chunk.text)
+            if chunk.usage_metadata:
+              usage = chunk.usage_metadata
+        except self._api_error as e:
           if e.code == 503:
             self._logger.log_warning("Gemini service is currently unavailable (503). Queuing SLUMBER and retrying.")
         
@@ -212,7 +343,7 @@ IMPORTANT: DO NOT TRY TO WRITE_FILE IN core/ ONLY IN secondary/ OR data/
 
           new_queue = [
               SlumberAction(
-                  seconds=self._constants['AGENT']['GEMINI_WAIT_SECONDS'],
+                  seconds=self._retry_wait_seconds(),
                   explanation="gemini error, waiting to retry"
               ),
               current_action
@@ -220,9 +351,11 @@ IMPORTANT: DO NOT TRY TO WRITE_FILE IN core/ ONLY IN secondary/ OR data/
             
           return new_queue
         
-        response_text = response.text
-        self._logger.log_debug(f"Gemini raw response: {response_text}")
-        if response_text is not None:
+        self._retry_attempt = 0
+        self._record_usage(usage)
+        response_text = "".join(chunks)
+        self._logger.log_debug(lambda: f"Gemini raw response: {response_text}")
+        if response_text:
           parsed_response = GeminiResponse.model_validate_json(response_text)
           if parsed_response.actions:
               return parsed_response.actions
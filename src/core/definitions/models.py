@@ -1,5 +1,5 @@
 from typing import Dict, Any, List, Literal, Union, Annotated, ClassVar
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum
 
 class LogType(Enum):
@@ -26,7 +26,10 @@ class ActionType(str, Enum):
 
 class BaseAction(BaseModel):
     """Represents a single, executable action proposed by the brain."""
-    type: ActionType = Field(frozen=True)
+    # frozen: queued actions are shared and cached by id
+    model_config = ConfigDict(frozen=True)
+
+    type: ActionType
     explanation: str = ""
 
 class NoOpAction(BaseAction):
@@ -110,10 +113,14 @@ Action = Annotated[
     Field(discriminator='type')
 ]
 
+class Counters(BaseModel):
+    """Represents the agent's counters, with one field named after each Count member."""
+    REASON: int = 0
+
 class Mem(BaseModel):
     """Represents the overall Agent memory."""
     action_queue: List[Action] = []
-    counters: Dict[Count, int] = {}
+    counters: Counters = Field(default_factory=Counters)
     file_contents: Dict[str, str] = {}
     thoughts: Dict [str, str] = {}
     logs: List[str] = []
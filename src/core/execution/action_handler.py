@@ -1,9 +1,10 @@
 import os
 import time
-from typing import Dict, Any
+from typing import Any, Callable, Dict, Tuple
 from core.logger import Logger
 from core.definitions.models import (
     Action, 
+    ActionType,
     ThinkAction, 
     RunToolAction, 
     ToDoType,
@@ -19,16 +20,44 @@ from core.execution.toolbox import ToolBox
 
 class ActionHandler:
     """Manages the execution of actions other than the REASON action."""
+    __slots__ = ('_constants', '_logger', '_memory', '_toolbox', '_read_stats', '_dispatch', '_todo_dispatch')
+
     def __init__(self, constants: Dict[str, Any], logger: Logger, memory: Memory):
         self._constants = constants
         self._logger = logger
         self._memory = memory
         self._toolbox = ToolBox(constants, logger, memory)
 
+        # (mtime_ns, size) of each file at its last READ_FILE
+        self._read_stats: Dict[str, Tuple[int, int]] = {}
+
+        # REASON and TERMINATE are handled by the agent loop
+        self._dispatch: Dict[ActionType, Callable[[Action], None]] = {
+            ActionType.NO_OP: self._handle_no_op,
+            ActionType.THINK: self._handle_think,
+            ActionType.RUN_TOOL: self._handle_run_tool,
+            ActionType.UPDATE_TODO: self._handle_update_todo,
+            ActionType.READ_FILE: self._handle_read_file,
+            ActionType.WRITE_FILE: self._handle_write_file,
+            ActionType.DELETE_FILE: self._handle_delete_file,
+            ActionType.SLUMBER: self._handle_slumber
+        }
+
+        # todo_type -> (memory update, takes todo item)
+        self._todo_dispatch: Dict[ToDoType, Tuple[Callable[..., None], bool]] = {
+            ToDoType.APPEND: (memory.add_todo, True),
+            ToDoType.INSERT: (memory.add_immediate_todo, True),
+            ToDoType.REMOVE: (memory.remove_todo, False)
+        }
+
+    @staticmethod
+    def _suffix(explanation: str) -> str:
+        """Formats the explanation tail of an action log line, empty if there is none."""
+        return f" - {explanation}" if explanation else ""
+
     def exec_action(self, action: Action):
         """Executes a successfully parsed Action."""
-        handle_func = getattr(self, f"_handle_{action.type.name.lower()}", self._handle_unknown)
-        handle_func(action)
+        self._dispatch.get(action.type, self._handle_unknown)(action)
 
     def _handle_unknown(self, action: Action):
         """Handles actions that are not recognized."""
@@ -45,11 +74,10 @@ class ActionHandler:
         is_delete = action.delete
         op_string = 'DELETE' if is_delete else 'INSERT'
 
-        self._logger.log_action(action, f"{op_string} {label} - {action.explanation}")
-        thoughts = self._memory.list_thoughts()
+        self._logger.log_action(action, "%s %s%s", op_string, label, self._suffix(action.explanation))
 
         if is_delete:
-            if not label in thoughts:
+            if not self._memory.has_thought(label):
                 raise ValueError("THINK action tried to delete thought that doesn't exist.")
             self._memory.remove_thought(label)
         
@@ -61,71 +89,72 @@ class ActionHandler:
         module = action.module
         tool_class = action.tool_class
         args = action.arguments
-        self._logger.log_action(action, f"{tool_class} with args: {str(args)} - {action.explanation}")
+        self._logger.log_action(action, "%s with args: %r%s", tool_class, args, self._suffix(action.explanation))
         self._toolbox.run_tool(module, tool_class, args)
 
     def _handle_update_todo(self, action: UpdateToDoAction):
         """Handles the UPDATE_TODO action."""
-        if action.todo_type == ToDoType.NONE:
+        entry = self._todo_dispatch.get(action.todo_type)
+        if entry is None:
             return
         
-        elif action.todo_type == ToDoType.APPEND:
-            self._memory.add_todo(action.todo_item)
-            self._logger.log_action(action, f"{action.todo_type} {action.todo_item} - {action.explanation}")
-
-        elif action.todo_type == ToDoType.INSERT:
-            self._memory.add_immediate_todo(action.todo_item)
-            self._logger.log_action(action, f"{action.todo_type} {action.todo_item} - {action.explanation}")
-
-        elif action.todo_type == ToDoType.REMOVE:
-            self._memory.remove_todo()
-            self._logger.log_action(action, f"{action.todo_type} - {action.explanation}")
+        update, takes_item = entry
+        if takes_item:
+            update(action.todo_item)
+            self._logger.log_action(action, "%s %s%s", action.todo_type, action.todo_item, self._suffix(action.explanation))
+        else:
+            update()
+            self._logger.log_action(action, "%s%s", action.todo_type, self._suffix(action.explanation))
 
     def _handle_read_file(self, action: ReadFileAction):
         """Handles the READ_FILE action."""
         file_path = os.path.abspath(action.file_path)
-        mem_files = self._memory.get_filepaths()
-        self._logger.log_action(action, f"{file_path} - {action.explanation}")
+        self._logger.log_action(action, "%s%s", file_path, self._suffix(action.explanation))
 
         if not file_path:
             raise ValueError("READ_FILE action requires 'file_path' argument.")
         
-        if file_path not in mem_files:
+        if not self._memory.has_file(file_path):
             raise ValueError(f"File path '{file_path}' is not tracked in memory.")
 
+        # Skip files unchanged since the last read
+        stat = os.stat(file_path)
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+        if self._read_stats.get(file_path) == stat_key:
+            return
+
         contents = read_file(file_path)
         self._memory.fill_file_contents(file_path, contents)
+        self._read_stats[file_path] = stat_key
 
     def _handle_write_file(self, action: WriteFileAction):
         """Handles the WRITE_FILE action."""
         file_path = os.path.abspath(action.file_path)
-        contents = action.contents
-        self._logger.log_action(action, f"{file_path} - {action.explanation}")
+        self._logger.log_action(action, "%s%s", file_path, self._suffix(action.explanation))
 
         if not file_path:
             raise ValueError("WRITE_FILE action requires 'file_path' argument.")
         
-        if action.use_thought:
-            write_file(file_path, self._memory.get_thought(action.use_thought))
-        else:
-            write_file(file_path, contents)
-
+        # Same contents for disk and memory
+        contents = self._memory.get_thought(action.use_thought) if action.use_thought else action.contents
+        write_file(file_path, contents)
         self._memory.fill_file_contents(file_path, contents)
+        self._read_stats.pop(file_path, None)
 
     def _handle_delete_file(self, action: DeleteFileAction):
         """Handles the DELETE_FILE action."""
         file_path = os.path.abspath(action.file_path)
-        mem_files = self._memory.get_filepaths()
-        self._logger.log_action(action, f"{file_path} - {action.explanation}")
+        self._logger.log_action(action, "%s%s", file_path, self._suffix(action.explanation))
 
         if not file_path:
             raise ValueError("DELETE_FILE action requires 'file_path' argument.")
         
-        if file_path not in mem_files:
+        if not self._memory.has_file(file_path):
             raise ValueError(f"File path '{file_path}' is not tracked in memory.")
         
         delete_file(file_path)
         self._memory.remove_file(file_path)
+        self._read_stats.pop(file_path, None)
 
     def _handle_slumber(self, action: SlumberAction):
         """Handles the SLUMBER action."""
@@ -1,5 +1,5 @@
 import importlib
-from typing import Any, Dict
+from typing import Any, Dict, Tuple, Type
 from core.logger import Logger
 from core.brain.memory import Memory
 
@@ -19,17 +19,29 @@ class ToolBox:
         self._constants = constants
         self._logger = logger
         self._memory = memory
+        self._tool_output_thought = constants['AGENT']['TOOL_OUTPUT_THOUGHT']
+        self._tool_cache: Dict[Tuple[str, str], Type[Tool]] = {}
 
     def run_tool(self, module_str: str, tool_class: str, args: Dict[str, Any]):
+        tool = self._resolve_tool(module_str, tool_class)
+        tool_instance = tool(self._constants, self._logger, self._memory)
+        output = tool_instance.run(args)
+        self._memory.set_thought(self._tool_output_thought, output)
+
+    def _resolve_tool(self, module_str: str, tool_class: str) -> Type[Tool]:
+        """Imports and validates a tool class, caching it so repeat runs skip the import machinery."""
+        key = (module_str, tool_class)
+        tool = self._tool_cache.get(key)
+        if tool is not None:
+            return tool
+
         module = importlib.import_module(module_str)
         if not module: 
             raise ValueError("RUN_TOOL tried to run a tool module that doesn't exist.")
         
         tool = getattr(module, tool_class)
-        if tool and issubclass(tool, Tool):
-            tool_instance = tool(self._constants, self._logger, self._memory)
-            output = tool_instance.run(args)
-            self._memory.set_thought(self._constants['AGENT']['TOOL_OUTPUT_THOUGHT'], output)
-                
-        else:
-            raise ValueError("RUN_TOOL tried to run a tool class that doesn't exist.")
\ No newline at end of file
+        if not (tool and issubclass(tool, Tool)):
+            raise ValueError("RUN_TOOL tried to run a tool class that doesn't exist.")
+
+        self._tool_cache[key] = tool
+        return tool
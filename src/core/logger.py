@@ -1,6 +1,17 @@
-from typing import Any, Dict, List, Union
+import os
+import atexit
+import threading
+import collections
+from typing import Any, Callable, Dict, List, Union
 from core.definitions.models import LogType, Action
-from core.utilities import append_file, current_timestamp, read_file_tail
+from core.utilities import current_timestamp, read_file_tail, write_all
+
+# Buffered log lines flush after this delay or past this size
+LOG_FLUSH_SECONDS = 0.05
+LOG_FLUSH_BYTES = 64 * 1024
+
+# Warnings and errors are written to the log file immediately
+_WARNING_LEVEL = LogType.WARNING.value
 
 class Logger:
     """Manages logging and printing to the console"""
@@ -10,6 +21,27 @@ class Logger:
         self._log_level = constants['LOG_LEVEL']
         self._log_file = self._constants['FILE_PATHS']['LOG_FILE']
 
+        # Recent log tail kept in memory
+        tail_count = self._constants['AGENT']['LOG_TAIL_COUNT']
+        tail: List[str] = []
+        self._log_fd = None
+        self._log_max_bytes = self._constants['AGENT']['LOG_MAX_BYTES']
+        self._log_size = 0
+        if os.path.exists(self._log_file):
+            tail = read_file_tail(self._log_file, tail_count)
+            # Raw O_APPEND descriptor, one append per flushed batch
+            self._log_fd = os.open(self._log_file, os.O_WRONLY | os.O_APPEND)
+            # Size tracked for rotation
+            self._log_size = os.fstat(self._log_fd).st_size
+            atexit.register(self.close)
+        self._recent_logs = collections.deque(tail, maxlen=tail_count)
+
+        # Lines waiting to be flushed to the log file
+        self._buffer: List[bytes] = []
+        self._buffer_bytes = 0
+        self._lock = threading.Lock()
+        self._flush_timer: Union[threading.Timer, None] = None
+
     def _log(self, log_type: LogType, msg: str, action: Union[Action, None] = None):
         if log_type.value > self._log_level:
             return
@@ -24,10 +56,89 @@ class Logger:
 
         time_str = current_timestamp()
         file_log_str = f"[{time_str}]{log_str}\n"
-        append_file(self._log_file, file_log_str)
+        self._recent_logs.append(file_log_str)
+        if self._log_fd is None:
+            return
+
+        data = file_log_str.encode('utf-8', 'replace')
+        with self._lock:
+            self._buffer.append(data)
+            self._buffer_bytes += len(data)
+            flush_now = log_type.value <= _WARNING_LEVEL or self._buffer_bytes >= LOG_FLUSH_BYTES
+            if not flush_now and self._flush_timer is None:
+                self._flush_timer = threading.Timer(LOG_FLUSH_SECONDS, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        if flush_now:
+            self.flush()
+
+    def flush(self):
+        """Writes any buffered log lines to the log file in one append."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._buffer or self._log_fd is None:
+                return
+            data = b"".join(self._buffer)
+            self._buffer.clear()
+            self._buffer_bytes = 0
+
+            # Fall back to console-only logging on log file errors
+            try:
+                write_all(self._log_fd, data)
+            except OSError as e:
+                print(f"[WARNING]: Failed to write log file, logging to console only: {e}")
+                self._close_fd()
+                return
+
+            self._log_size += len(data)
+            if self._log_size >= self._log_max_bytes:
+                self._rotate()
+
+    def _rotate(self):
+        """Moves the full log file to <log file>.1 and starts a fresh one. Caller must hold the lock."""
+        try:
+            os.replace(self._log_file, self._log_file + '.1')
+        except OSError as e:
+            # Log file moved or removed, a fresh one is still opened below
+            print(f"[WARNING]: Failed to rotate log file: {e}")
+
+        # Open the new file before closing the old one
+        try:
+            new_fd = os.open(self._log_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        except OSError as e:
+            print(f"[WARNING]: Failed to reopen log file, logging to console only: {e}")
+            self._close_fd()
+            return
+
+        self._close_fd()
+        self._log_fd = new_fd
+        self._log_size = 0
+
+    def _close_fd(self):
+        """Closes the log file descriptor, ignoring errors. Caller must hold the lock."""
+        if self._log_fd is None:
+            return
+        try:
+            os.close(self._log_fd)
+        except OSError:
+            pass
+        self._log_fd = None
+
+    def close(self):
+        """Flushes pending lines and closes the log file; later logs still reach the console and recent tail."""
+        self.flush()
+        with self._lock:
+            self._close_fd()
+        atexit.unregister(self.close)
+
+    def is_enabled(self, log_type: LogType) -> bool:
+        """Checks whether messages of a log type would be emitted at the current level."""
+        return log_type.value <= self._log_level
 
     def recent_logs(self) -> List[str]:
-        return read_file_tail(self._log_file, self._constants['AGENT']['LOG_TAIL_COUNT'])
+        return list(self._recent_logs)
 
     def log_error(self, msg: str):
         self._log(LogType.ERROR, msg)
@@ -35,11 +146,17 @@ class Logger:
     def log_warning(self, msg: str):
         self._log(LogType.WARNING, msg)
     
-    def log_action(self, action: Action, msg: str):
-        self._log(LogType.ACTION, msg, action)
+    def log_action(self, action: Action, msg: str, *args: Any):
+        """Logs an action, %-formatting msg with args only if action logs are enabled."""
+        if not self.is_enabled(LogType.ACTION):
+            return
+        self._log(LogType.ACTION, msg % args if args else msg, action)
 
     def log_info(self, msg: str):
         self._log(LogType.INFO, msg)
 
-    def log_debug(self, msg: str):
-        self._log(LogType.DEBUG, msg)
\ No newline at end of file
+    def log_debug(self, msg: Union[str, Callable[[], str]]):
+        """Logs a debug message; pass a callable to skip building an expensive message when debug is off."""
+        if not self.is_enabled(LogType.DEBUG):
+            return
+        self._log(LogType.DEBUG, msg() if callable(msg) else msg)
\ No newline at end of file
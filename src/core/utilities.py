@@ -1,31 +1,43 @@
 import os
 import json
+import time
 import yaml
+import orjson
 import collections
 from typing import Any, Dict, List, Union, Type, TypeVar
-from datetime import datetime, timezone
 from pydantic import BaseModel
 
 T = TypeVar('T', bound=BaseModel)
 
+# Use the libyaml-backed loader/dumper when PyYAML was built with it
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YamlDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
 # --- File Scanning Utility Function ---
 
 def scan_files(base_dir: str = '/app/', ignore_list: List[str] = []) -> List[str]:
     """Returns absolute file paths for all files in the specified directory"""
-    base_path = os.path.abspath(base_dir)
+    ignored = frozenset(ignore_list)
     file_paths: List[str] = []
+    pending_dirs = [os.path.abspath(base_dir)]
     
-    for root, dirs, files in os.walk(base_path, topdown=True):
-        dirs[:] = [d for d in dirs if d not in ignore_list]
-
-        for filename in files:
-            absolute_path = os.path.join(root, filename)
-            
-            if not filename in ignore_list:
-                path_segments = absolute_path.split(os.sep)
-                if any(segment in ignore_list for segment in path_segments):
-                    is_ignored = True
-                file_paths.append(absolute_path)
+    # scandir entries carry their type, no extra stat needed
+    while pending_dirs:
+        try:
+            entries = os.scandir(pending_dirs.pop())
+        except OSError:
+            continue
+
+        with entries:
+            for entry in entries:
+                if entry.name in ignored:
+                    continue
+                if entry.is_dir():
+                    # Like os.walk, don't descend into symlinked directories
+                    if not entry.is_symlink():
+                        pending_dirs.append(entry.path)
+                else:
+                    file_paths.append(entry.path)
                           
     return file_paths
 
@@ -45,21 +57,22 @@ def yaml_safe_load(file_path: str) -> Union[Dict[str, Any], List[Any]]:
         raise FileNotFoundError(f"YAML file not found: {file_path}")
     
     with open(file_path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YamlLoader)
 
 def yaml_safe_dump(data: Any, file_path: str):
     """Dumps content to a YAML file."""
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
     
     with open(file_path, 'w', encoding='utf-8') as f:
-        yaml.safe_dump(data, f, default_flow_style=False)
+        yaml.dump(data, f, Dumper=_YamlDumper, default_flow_style=False)
 
 
 # --- JSON Utility Functions ---
 
 def json_typed_load(obj_type: Type[T], file_path: str) -> T:
     """Loads content from a JSON file."""
-    with open(file_path, 'r', encoding='utf-8') as f:
+    # pydantic parses the raw bytes directly
+    with open(file_path, 'rb') as f:
         return obj_type.model_validate_json(f.read())
 
 def json_load(file_path: str) -> Union[Dict[str, Any], List[Any]]:
@@ -70,14 +83,29 @@ def json_load(file_path: str) -> Union[Dict[str, Any], List[Any]]:
 def json_dump(data: Any, file_path: str):
     """Dumps content to a JSON file."""
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    with open(file_path, 'w', encoding='utf-8') as f:
-        if (isinstance(data, BaseModel)):
-            data = data.model_dump()
-        json.dump(data, f, indent=4)
+    if (isinstance(data, BaseModel)):
+        data = data.model_dump()
+    # Indented for hand editing
+    payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    # Atomic write: temp file, fsync, rename
+    tmp_path = file_path + '.tmp'
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        write_all(fd, payload)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, file_path)
 
 
 # --- File I/O Utility Functions ---
 
+def write_all(fd: int, data: bytes):
+    """Writes all of data to a raw file descriptor, retrying on short writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
 def read_file(file_path: str) -> str:
     """Reads the entire content of a file (utf-8)."""
     with open(file_path, 'r', encoding='utf-8') as f:
@@ -86,14 +114,12 @@ def read_file(file_path: str) -> str:
 def write_file(file_path: str, content: str):
     """Writes content to a file, creating directories if necessary (utf-8)."""
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-
-def append_file(file_path: str, content: str):
-    """Appends to an existing file (utf-8)."""
-    if os.path.exists(file_path):
-        with open(file_path, 'a', encoding='utf-8') as f:
-            f.write(content)
+    # Write the encoded bytes straight to the raw fd
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        write_all(fd, content.encode('utf-8'))
+    finally:
+        os.close(fd)
 
 def delete_file(file_path: str):
     """Deletes a file if it exists."""
@@ -109,4 +135,4 @@ def read_file_tail(file_path: str, x: int) -> List[str]:
 # --- Time Utility Functions ---
 
 def current_timestamp() -> str:
-    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S %Z")
\ No newline at end of file
+    return time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime())
\ No newline at end of file
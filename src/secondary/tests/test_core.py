@@ -1,12 +1,18 @@
 import os
+import copy
+import json
+import types
 import pytest
 import time
 from collections.abc import Generator
 
 # --- Import Core Components ---
-from core.agent_core import AgentCore, CONSTANTS_YAML
+from core.agent_core import AgentCore, CONSTANTS_YAML, main
+from core.logger import Logger
+from core.brain.reason import RateLimiter
 from core.utilities import yaml_dict_load, write_file, read_file, delete_file
 from core.definitions.models import (
+    LogType,
     NoOpAction,
     ActionType,
     ReasonAction,
@@ -57,7 +63,8 @@ def agent_setup() -> Generator[AgentCore]:
     yield agent
     
     # --- Teardown (runs after each test) ---
-    # Clean up the files created during the test
+    # Release the log file descriptor, then clean up the files created during the test
+    agent._logger.close()
     if os.path.exists(test_log_file):
         os.remove(test_log_file)
     if os.path.exists(test_mem_file):
@@ -126,6 +133,29 @@ def test_handle_write_file(agent_setup):
     # Cleanup
     delete_file(file_path)
 
+def test_handle_write_file_from_thought(agent_setup):
+    """Tests writing a file using a thought as its contents."""
+    agent = agent_setup
+
+    file_path = os.path.join(TEST_DATA_DIR, "test_write_thought.txt")
+    label = "test_write_thought"
+    content = "Hello from a thought"
+    agent._memory.set_thought(label, content)
+
+    write_action = WriteFileAction(
+        explanation="Testing file writing from a thought",
+        file_path=file_path,
+        use_thought=label
+    )
+    agent._action_handler.exec_action(write_action)
+
+    # Verify disk and memory both hold the thought contents
+    assert read_file(file_path) == content
+    assert agent._memory.get_file_contents(file_path) == content
+
+    # Cleanup
+    delete_file(file_path)
+
 def test_handle_read_file(agent_setup):
     """Tests reading a file into memory."""
     agent = agent_setup
@@ -151,6 +181,85 @@ def test_handle_read_file(agent_setup):
     # Cleanup
     delete_file(file_path)
 
+def count_file_reads(monkeypatch: pytest.MonkeyPatch) -> list:
+    """Wraps the action handler's read_file, recording each path it reads."""
+    reads = []
+    def counting_read_file(file_path: str) -> str:
+        reads.append(file_path)
+        return read_file(file_path)
+    monkeypatch.setattr("core.execution.action_handler.read_file", counting_read_file)
+    return reads
+
+def test_handle_read_file_skips_unchanged(agent_setup, monkeypatch: pytest.MonkeyPatch):
+    """Tests that reading an unchanged file reuses memory, and changes on disk force a re-read."""
+    agent = agent_setup
+    reads = count_file_reads(monkeypatch)
+
+    file_path = os.path.join(TEST_DATA_DIR, "test_read_cache.txt")
+    write_file(file_path, "First contents")
+    agent._memory.fill_file_contents(file_path, "")
+    read_action = ReadFileAction(
+        explanation="Testing cached file reading",
+        file_path=file_path
+    )
+
+    # A second read of the unchanged file doesn't touch the disk
+    agent._action_handler.exec_action(read_action)
+    agent._action_handler.exec_action(read_action)
+    assert len(reads) == 1
+    assert agent._memory.get_file_contents(file_path) == "First contents"
+
+    # A new size forces a re-read
+    write_file(file_path, "Second, longer contents")
+    agent._action_handler.exec_action(read_action)
+    assert len(reads) == 2
+    assert agent._memory.get_file_contents(file_path) == "Second, longer contents"
+
+    # So does a new mtime with the same size
+    write_file(file_path, "Changed, longer content")
+    stat = os.stat(file_path)
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    agent._action_handler.exec_action(read_action)
+    assert len(reads) == 3
+    assert agent._memory.get_file_contents(file_path) == "Changed, longer content"
+
+    # Cleanup
+    delete_file(file_path)
+
+def test_handle_read_file_cache_cleared(agent_setup, monkeypatch: pytest.MonkeyPatch):
+    """Tests that writing or deleting a file drops its cached read."""
+    agent = agent_setup
+    reads = count_file_reads(monkeypatch)
+    read_stats = agent._action_handler._read_stats
+
+    file_path = os.path.join(TEST_DATA_DIR, "test_read_cache_cleared.txt")
+    write_file(file_path, "Original contents")
+    agent._memory.fill_file_contents(file_path, "")
+    read_action = ReadFileAction(
+        explanation="Testing cached file reading",
+        file_path=file_path
+    )
+    agent._action_handler.exec_action(read_action)
+    assert file_path in read_stats
+
+    # WRITE_FILE clears the entry, so the next read goes to disk
+    agent._action_handler.exec_action(WriteFileAction(
+        explanation="Testing cache clearing on write",
+        file_path=file_path,
+        contents="Written contents"
+    ))
+    assert file_path not in read_stats
+    agent._action_handler.exec_action(read_action)
+    assert len(reads) == 2
+    assert file_path in read_stats
+
+    # DELETE_FILE clears the entry too
+    agent._action_handler.exec_action(DeleteFileAction(
+        explanation="Testing cache clearing on delete",
+        file_path=file_path
+    ))
+    assert file_path not in read_stats
+
 def test_handle_delete_file(agent_setup):
     """Tests deleting a file."""
     agent = agent_setup
@@ -282,8 +391,281 @@ def test_handle_no_op(agent_setup):
     except Exception as e:
         pytest.fail(f"NO_OP action raised an exception: {e}")
 
+# --- MEMORY UNIT TESTS ---
+
+def test_memorize_skips_unchanged_memory(agent_setup):
+    """Tests that memory is only written to disk after it changes."""
+    agent = agent_setup
+    memory_file = agent._constants['FILE_PATHS']['MEMORY_FILE']
+
+    # Nothing changed since the last save, so the file should not be rewritten
+    agent._memory.memorize()
+    os.remove(memory_file)
+    agent._memory.memorize()
+    assert not os.path.exists(memory_file)
+
+    # A mutation marks memory as changed
+    agent._memory.add_todo("Task 1")
+    agent._memory.memorize()
+    assert os.path.exists(memory_file)
+
+def test_action_queue_order(agent_setup):
+    """Tests adding, prepending and popping actions at both ends of the queue."""
+    agent = agent_setup
+
+    agent._memory.empty_actions()
+    agent._memory.add_actions([NoOpAction(explanation="second"), NoOpAction(explanation="third")])
+    agent._memory.prepend_action(NoOpAction(explanation="first"))
+    assert [a.explanation for a in agent._memory.list_actions()] == ["first", "second", "third"]
+
+    assert agent._memory.pop_action().explanation == "first"
+    assert agent._memory.pop_last_action().explanation == "third"
+    assert [a.explanation for a in agent._memory.list_actions()] == ["second"]
+
+def test_load_logs(agent_setup):
+    """Tests that loading logs returns the logger's recent tail."""
+    agent = agent_setup
+
+    agent._logger.log_info("Testing load logs")
+    assert agent._memory.load_logs() == agent._logger.recent_logs()
+
+def test_has_file(agent_setup):
+    """Tests file tracking membership checks."""
+    agent = agent_setup
+    file_path = "/app/workspace/data/test_has_file.txt"
+
+    agent._memory.fill_file_contents(file_path, "contents")
+    assert agent._memory.has_file(file_path)
+
+    agent._memory.remove_file(file_path)
+    assert not agent._memory.has_file(file_path)
+
+# --- LOGGER UNIT TESTS ---
+
+def test_recent_logs(agent_setup):
+    """Tests that new log lines are kept in the recent log tail."""
+    agent = agent_setup
+
+    agent._logger.log_info("Testing recent logs")
+
+    recent = agent._logger.recent_logs()
+    assert recent[-1].endswith("[INFO]: Testing recent logs\n")
+    assert len(recent) <= agent._constants['AGENT']['LOG_TAIL_COUNT']
+
+def make_test_logger(agent: AgentCore, log_name: str, max_bytes: int) -> Logger:
+    """Builds a standalone logger on a fresh test log file with a custom rotation size."""
+    constants = copy.deepcopy(agent._constants)
+    log_file = os.path.join(TEST_DATA_DIR, log_name)
+    for path in (log_file, log_file + '.1'):
+        if os.path.exists(path):
+            os.remove(path)
+    write_file(log_file, "")
+
+    constants['FILE_PATHS']['LOG_FILE'] = log_file
+    constants['AGENT']['LOG_MAX_BYTES'] = max_bytes
+    return Logger(constants)
+
+def test_log_rotation(agent_setup):
+    """Tests that the log file is rotated once it passes LOG_MAX_BYTES."""
+    log_file = os.path.join(TEST_DATA_DIR, "test_rotate_log.txt")
+    logger = make_test_logger(agent_setup, "test_rotate_log.txt", 300)
+
+    # Warnings flush immediately, so each line reaches the file right away
+    for i in range(4):
+        logger.log_warning(f"Line {i} " + "x" * 40)
+    assert os.path.exists(log_file + '.1')
+    assert "Line 0" in read_file(log_file + '.1')
+
+    # Logging continues in a fresh file holding only lines after the rotation
+    logger.log_warning("After rotation")
+    contents = read_file(log_file)
+    assert "Line 0" not in contents
+    assert contents.endswith("[WARNING]: After rotation\n")
+
+    logger.close()
+    delete_file(log_file)
+    delete_file(log_file + '.1')
+
+def test_log_rotation_missing_file(agent_setup):
+    """Tests that rotating a log file removed while running recovers instead of raising."""
+    log_file = os.path.join(TEST_DATA_DIR, "test_rotate_missing_log.txt")
+    logger = make_test_logger(agent_setup, "test_rotate_missing_log.txt", 200)
+
+    logger.log_warning("Before removal")
+    os.remove(log_file)
+
+    # Crossing the size cap triggers a rotation that can't move the missing file
+    for i in range(2):
+        logger.log_warning(f"Line {i} " + "x" * 40)
+    logger.log_warning("After failed rotation")
+
+    # The logger holds a valid descriptor on a recreated log file
+    os.fstat(logger._log_fd)
+    assert read_file(log_file).endswith("[WARNING]: After failed rotation\n")
+
+    logger.close()
+    delete_file(log_file)
+    if os.path.exists(log_file + '.1'):
+        delete_file(log_file + '.1')
+
+def test_log_debug_lazy_message(agent_setup):
+    """Tests that callable debug messages are only built when debug logging is enabled."""
+    agent = agent_setup
+    built = []
+
+    def build_msg():
+        built.append(True)
+        return "Testing lazy debug"
+
+    # Debug off: the message is never built or logged
+    agent._logger._log_level = LogType.INFO.value
+    agent._logger.log_debug(build_msg)
+    assert not built
+    assert not any("Testing lazy debug" in log for log in agent._logger.recent_logs())
+
+    # Debug on: the message is built once and logged
+    agent._logger._log_level = LogType.DEBUG.value
+    agent._logger.log_debug(build_msg)
+    assert built == [True]
+    assert "[DEBUG]: Testing lazy debug" in agent._logger.recent_logs()[-1]
+
+# --- REASON UNIT TESTS ---
+
+class FakeClock:
+    """Stands in for time.monotonic and time.time so rate limit tests don't sleep."""
+    def __init__(self, wall_time: float):
+        self.monotonic_time = 1000.0
+        self.wall_time = wall_time
+
+    def advance(self, seconds: float):
+        self.monotonic_time += seconds
+        self.wall_time += seconds
+
+@pytest.fixture
+def fake_clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Patches the clocks the rate limiter reads, starting at noon UTC."""
+    clock = FakeClock(wall_time=20000 * 86400 + 43200)
+    monkeypatch.setattr("core.brain.reason.time.monotonic", lambda: clock.monotonic_time)
+    monkeypatch.setattr("core.brain.reason.time.time", lambda: clock.wall_time)
+    return clock
+
+def test_rate_limiter_requests_per_minute(fake_clock):
+    """Tests that the request bucket empties, reports the wait, and refills over time."""
+    limiter = RateLimiter(requests_per_minute=2, tokens_per_minute=1000, requests_per_day=100)
+    assert limiter.acquire() == 0
+    assert limiter.acquire() == 0
+
+    # The bucket refills at 2 per minute, so the next slot is 30s away
+    assert limiter.acquire() == 30
+    fake_clock.advance(15)
+    assert limiter.acquire() == 15
+    fake_clock.advance(15)
+    assert limiter.acquire() == 0
+
+def test_rate_limiter_tokens_per_minute(fake_clock):
+    """Tests that used tokens block calls until they leave the one minute window."""
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=50, requests_per_day=100)
+    assert limiter.acquire() == 0
+    limiter.record_tokens(50)
+
+    fake_clock.advance(10)
+    assert limiter.acquire() == 50
+
+    # Once the call is 60s old its tokens no longer count
+    fake_clock.advance(50)
+    assert limiter.acquire() == 0
+
+def test_rate_limiter_requests_per_day(fake_clock):
+    """Tests that the daily cap waits until the next UTC midnight and then resets."""
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=1000, requests_per_day=1)
+    assert limiter.acquire() == 0
+
+    # Started at noon, so midnight is 12 hours away
+    assert limiter.acquire() == 43200
+    fake_clock.advance(43200 - 100)
+    assert limiter.acquire() == 100
+
+    fake_clock.advance(100)
+    assert limiter.acquire() == 0
+    assert limiter.acquire() == 86400
+
+def test_gemini_retry_backoff(agent_setup, monkeypatch: pytest.MonkeyPatch):
+    """Tests that retry waits double with jitter, never exceed GEMINI_MAX_WAIT_SECONDS, and reset after a success."""
+    gemini = agent_setup._reason._gemini
+    gemini._constants['AGENT']['GEMINI_WAIT_SECONDS'] = 10
+    gemini._constants['AGENT']['GEMINI_MAX_WAIT_SECONDS'] = 100
+    gemini._retry_attempt = 0
+
+    # Always take the largest jitter so the waits are exact
+    monkeypatch.setattr("core.brain.reason.random.uniform", lambda low, high: high)
+    waits = [gemini._retry_wait_seconds() for _ in range(6)]
+    assert waits == [20, 30, 50, 90, 100, 100]
+
+    # A successful call starts the backoff over
+    chunk = types.SimpleNamespace(
+        text='{"actions": [{"type": "REASON", "explanation": "next", "task": "Continue"}]}',
+        usage_metadata=None
+    )
+    gemini._client = types.SimpleNamespace(
+        models=types.SimpleNamespace(generate_content_stream=lambda **kwargs: [chunk])
+    )
+    actions = gemini.get_next_actions(ReasonAction(task="Plan", explanation="testing backoff"))
+    assert actions[0].task == "Continue"
+    assert gemini._retry_wait_seconds() == 20
+
+def test_build_context_prompt(agent_setup):
+    """Tests that the context sends only requested, known files and thoughts, deduped in request order."""
+    agent = agent_setup
+    file_a = os.path.join(TEST_DATA_DIR, "test_context_a.txt")
+    file_b = os.path.join(TEST_DATA_DIR, "test_context_b.txt")
+    agent._memory.fill_file_contents(file_a, "Contents A")
+    agent._memory.fill_file_contents(file_b, "Contents B")
+    agent._memory.set_thought("thought_1", "Thought 1")
+    agent._memory.set_thought("thought_2", "Thought 2")
+
+    reason_action = ReasonAction(
+        task="Testing context",
+        explanation="Testing context building",
+        files_to_send=[file_b, file_a, file_b, "/missing/file.txt"],
+        thoughts_to_send=["thought_2", "missing_thought", "thought_1", "thought_2"]
+    )
+    prompt = agent._reason._gemini._build_context_prompt(reason_action)
+    assert prompt.startswith("# MY CURRENT TASK:\nTesting context\n")
+    memory = json.loads(prompt.split("# MY CURRENT MEMORY:\n", 1)[1])
+
+    assert list(memory) == [
+        "action_queue", "counters", "file_paths", "file_contents", "thoughts", "logs", "todo", "last_memorized"
+    ]
+    assert file_a in memory["file_paths"] and file_b in memory["file_paths"]
+    assert memory["file_contents"] == {file_b: "Contents B", file_a: "Contents A"}
+    assert list(memory["file_contents"]) == [file_b, file_a]
+    assert list(memory["thoughts"]) == ["thought_2", "thought_1"]
+    assert memory["thoughts"]["thought_2"] == "Thought 2"
+
 # --- AGENT CORE (E2E) TESTS ---
 
+def test_main_startup_failure_keeps_logs(monkeypatch: pytest.MonkeyPatch):
+    """Tests that logs buffered before a failed startup still reach the log file."""
+    constants = yaml_dict_load(os.path.join("/app/workspace", CONSTANTS_YAML))
+    test_log_file = os.path.join(TEST_DATA_DIR, "test_startup_log.txt")
+    test_mem_file = os.path.join(TEST_DATA_DIR, "test_startup_memory.json")
+    write_file(test_log_file, "")
+    write_file(test_mem_file, "{}")
+    constants['FILE_PATHS']['LOG_FILE'] = test_log_file
+    constants['FILE_PATHS']['MEMORY_FILE'] = test_mem_file
+
+    # Without an API key, Gemini fails partway through AgentCore initialization
+    monkeypatch.setattr("core.agent_core.yaml_dict_load", lambda path: constants)
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    assert main() == 1
+
+    log_contents = read_file(test_log_file)
+    assert "[INFO]: Initializing AgentCore" in log_contents
+    assert "[ERROR]: Critical error during Agent execution" in log_contents
+
+    delete_file(test_log_file)
+    delete_file(test_mem_file)
+
 def test_empty_todo_terminates(agent_setup):
     """
     Tests that the agent core loop correctly identifies an empty todo list